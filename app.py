@@ -1,17 +1,22 @@
 """
-Flask REST API for controlling Pimoroni Unicorn HAT 8x8 LED Matrix.
+FastAPI REST API for controlling Pimoroni Unicorn HAT 8x8 LED Matrix.
 Accepts an 8x8 grid of RGB colors and displays them on the HAT.
 """
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
-from collections import deque
-import threading
+from typing import Annotated
+import msgspec
+import numpy as np
+import orjson
 import os
-import json
-from openai import OpenAI
+import struct
+import time
+from openai import AsyncOpenAI
 
 # Try to import unicornhat - will fail on non-Raspberry Pi systems
 try:
@@ -21,17 +26,159 @@ except ImportError:
     UNICORN_AVAILABLE = False
     print("WARNING: unicornhat module not available. Running in simulation mode.")
 
-app = Flask(__name__)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the auto-off and render background tasks for the lifetime of the app."""
+    global auto_off_wake, render_wake
+
+    # Created here so they bind to the server's loop (required on Python 3.9)
+    auto_off_wake = asyncio.Event()
+    render_wake = asyncio.Event()
+
+    tasks = [asyncio.create_task(auto_off_loop()), asyncio.create_task(render_loop())]
+    for task in tasks:
+        task.add_done_callback(log_task_exit)
+    yield
+    for task in tasks:
+        task.cancel()
+
+def log_task_exit(task: asyncio.Task):
+    """Log a background task that stopped because of an exception."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background task %s stopped: %r", task.get_coro().__name__, task.exception())
+
+app = FastAPI(lifespan=lifespan)
+
+def ojsonify(obj, status_code: int = 200) -> Response:
+    """Serialize obj with orjson into a JSON response."""
+    return Response(orjson.dumps(obj), status_code=status_code, media_type='application/json')
+
+# Request bodies above this are rejected before being read; a full 8x8 grid is ~1KB
+MAX_BODY_BYTES = 4096
+PAYLOAD_TOO_LARGE_BODY = b'{"error":"Request body too large"}'
+INVALID_CONTENT_LENGTH_BODY = b'{"error":"Invalid Content-Length header"}'
+
+async def send_json_error(send, status: int, body: bytes):
+    """Send a complete JSON error response directly over ASGI."""
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+class PayloadTooLarge(Exception):
+    """Raised when a streamed request body exceeds MAX_BODY_BYTES."""
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware that caps request body size at MAX_BODY_BYTES.
+    Oversized Content-Length is answered with 413 straight away; bodies
+    without one are counted as they arrive.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope['headers']:
+            if name == b'content-length':
+                try:
+                    content_length = int(value)
+                except ValueError:
+                    await send_json_error(send, 400, INVALID_CONTENT_LENGTH_BODY)
+                    return
+
+                if content_length > MAX_BODY_BYTES:
+                    await send_json_error(send, 413, PAYLOAD_TOO_LARGE_BODY)
+                    return
+                break
+
+        received = 0
+
+        async def receive_limited():
+            nonlocal received
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > MAX_BODY_BYTES:
+                    raise PayloadTooLarge()
+            return message
+
+        await self.app(scope, receive_limited, send)
+
+@app.exception_handler(PayloadTooLarge)
+async def payload_too_large_handler(request: Request, exc: PayloadTooLarge):
+    """Report streamed bodies over the size cap as 413."""
+    return Response(PAYLOAD_TOO_LARGE_BODY, status_code=413, media_type='application/json')
+
+app.add_middleware(BodySizeLimitMiddleware)
 
 # CORS configuration - allow requests from production frontend and local dev server
-ALLOWED_ORIGINS = [
-    'https://lights-ui.vercel.app',
-    'http://localhost:5173',
+ALLOWED_ORIGINS = frozenset({
+    b'https://lights-ui.vercel.app',
+    b'http://localhost:5173',
+})
+CORS_PREFLIGHT_HEADERS = [
+    (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+    (b'access-control-allow-headers', b'Content-Type, ngrok-skip-browser-warning, User-Agent'),
+    (b'access-control-max-age', b'600'),
 ]
-CORS(app, 
-     origins=ALLOWED_ORIGINS, 
-     allow_headers=['Content-Type', 'ngrok-skip-browser-warning', 'User-Agent'],
-     methods=['GET', 'POST', 'OPTIONS'])
+
+class CORSHeadersMiddleware:
+    """
+    Minimal ASGI CORS middleware for a fixed set of origins.
+    Origins are matched by set membership on the raw header bytes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        preflight = False
+        for name, value in scope['headers']:
+            if name == b'origin':
+                origin = value
+            elif name == b'access-control-request-method':
+                preflight = True
+
+        if origin not in ALLOWED_ORIGINS:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [(b'access-control-allow-origin', origin), (b'vary', b'Origin')]
+
+        # Answer preflight requests directly without touching the router
+        if preflight and scope['method'] == 'OPTIONS':
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': cors_headers + CORS_PREFLIGHT_HEADERS + [(b'content-length', b'0')],
+            })
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        async def send_with_cors(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = list(message.get('headers', [])) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+# Added last so it is outermost and 413 responses still carry CORS headers
+app.add_middleware(CORSHeadersMiddleware)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -40,7 +187,7 @@ logger = logging.getLogger(__name__)
 # Initialize OpenAI client
 openai_client = None
 if os.environ.get('OPENAI_API_KEY'):
-    openai_client = OpenAI()
+    openai_client = AsyncOpenAI()
     logger.info("OpenAI client initialized")
 else:
     logger.warning("OPENAI_API_KEY not set. AI generation will not be available.")
@@ -49,59 +196,173 @@ else:
 GRID_WIDTH = 8
 GRID_HEIGHT = 8
 
+# Bits that must be clear in a valid coordinate - the grid is square with a
+# power-of-two side, so one AND checks both axes and both bounds
+COORD_MASK = ~(GRID_WIDTH - 1)
+
+# The health response never changes, so serialize it once
+HEALTH_BODY = orjson.dumps({
+    'status': 'ok',
+    'unicorn_available': UNICORN_AVAILABLE,
+    'grid_size': {'width': GRID_WIDTH, 'height': GRID_HEIGHT}
+})
+
 # Store last 10 grids in memory
 MAX_HISTORY = 10
-grid_history = deque(maxlen=MAX_HISTORY)
+# Fixed ring buffer: history_index is the next slot to write
+history_slots = [None] * MAX_HISTORY
+history_index = 0
+history_count = 0
+# Packed RGB bytes of the frame currently on display, None if unknown
+last_frame = None
 
-# Auto-off timer settings
+# Serialized /history body, rebuilt lazily after the history changes
+history_body = None
+
+# Auto-off settings - a single background task sleeps until the deadline
 AUTO_OFF_SECONDS = 10
-auto_off_timer = None
-timer_lock = threading.Lock()
+auto_off_deadline = None
+auto_off_wake = None
+
+# Rendering - handlers update the pixel buffer and a single task calls show()
+# at most once per frame interval, so bursts of updates share one refresh.
+# set_pixel/set_pixels only write the driver's in-memory buffer, so they run
+# directly on the event loop; only show() and off() go to a worker thread.
+FRAME_INTERVAL = 1 / 60
+render_wake = None
+
+# Request models - msgspec decodes and validates JSON bodies in one C pass
+ColorComponent = Annotated[int, msgspec.Meta(ge=0, le=255)]
+
+# Packs one validated color into its 3 RGB bytes
+RGB_STRUCT = struct.Struct('BBB')
+
+class Color(msgspec.Struct, gc=False):
+    r: ColorComponent = 0
+    g: ColorComponent = 0
+    b: ColorComponent = 0
+
+Row = Annotated[list[Color], msgspec.Meta(min_length=GRID_WIDTH, max_length=GRID_WIDTH)]
+
+Grid = Annotated[list[Row], msgspec.Meta(min_length=GRID_HEIGHT, max_length=GRID_HEIGHT)]
+
+class GridPayload(msgspec.Struct):
+    grid: Grid
+
+class PixelPayload(msgspec.Struct):
+    x: int
+    y: int
+    color: Color
+
+class BrightnessPayload(msgspec.Struct):
+    brightness: Annotated[float, msgspec.Meta(ge=0, le=1)]
+
+class GeneratePayload(msgspec.Struct):
+    word: str
+
+@app.exception_handler(msgspec.DecodeError)
+async def decode_error_handler(request: Request, exc: msgspec.DecodeError):
+    """Report malformed or invalid request bodies as 400."""
+    return ojsonify({'error': str(exc)}, 400)
+
+async def read_payload(request: Request, model: type[msgspec.Struct]) -> msgspec.Struct:
+    """
+    Decode and validate the JSON body straight into a msgspec Struct.
+    The result is cached on request.state.body for later consumers.
+    """
+    payload = msgspec.json.decode(await request.body() or b'{}', type=model)
+    request.state.body = payload
+    return payload
 
 def schedule_auto_off():
     """Schedule the display to turn off after AUTO_OFF_SECONDS."""
-    global auto_off_timer
-    
-    with timer_lock:
-        # Cancel any existing timer
-        if auto_off_timer is not None:
-            auto_off_timer.cancel()
-        
-        # Schedule new timer
-        auto_off_timer = threading.Timer(AUTO_OFF_SECONDS, auto_off_callback)
-        auto_off_timer.daemon = True
-        auto_off_timer.start()
-        logger.info(f"Auto-off scheduled in {AUTO_OFF_SECONDS} seconds")
+    global auto_off_deadline
+
+    auto_off_deadline = asyncio.get_running_loop().time() + AUTO_OFF_SECONDS
+    auto_off_wake.set()
+    logger.info("Auto-off scheduled in %d seconds", AUTO_OFF_SECONDS)
 
 def cancel_auto_off():
-    """Cancel the auto-off timer."""
-    global auto_off_timer
-    
-    with timer_lock:
-        if auto_off_timer is not None:
-            auto_off_timer.cancel()
-            auto_off_timer = None
-            logger.info("Auto-off timer cancelled")
-
-def auto_off_callback():
-    """Callback function to turn off the display."""
-    global auto_off_timer
-    
-    with timer_lock:
-        auto_off_timer = None
-    
-    clear()
-    logger.info("Display auto-off triggered")
-
-def save_grid_to_history(grid: list):
-    """Save a grid to the history with timestamp."""
-    entry = {
-        'id': datetime.now().isoformat(),
-        'grid': grid,
-        'timestamp': datetime.now().isoformat()
+    """Cancel the pending auto-off, if any."""
+    global auto_off_deadline
+
+    if auto_off_deadline is not None:
+        auto_off_deadline = None
+        logger.info("Auto-off timer cancelled")
+
+async def auto_off_loop():
+    """Background task that turns the display off once the deadline passes."""
+    global auto_off_deadline
+
+    loop = asyncio.get_running_loop()
+    while True:
+        if auto_off_deadline is None:
+            # Idle until a handler schedules an auto-off
+            auto_off_wake.clear()
+            await auto_off_wake.wait()
+            continue
+
+        # The deadline may be pushed back while sleeping, so re-check it
+        remaining = auto_off_deadline - loop.time()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+            continue
+
+        auto_off_deadline = None
+        try:
+            await asyncio.to_thread(clear)
+            logger.info("Display auto-off triggered")
+        except Exception as e:
+            logger.error("Error during auto-off: %s", e)
+
+def request_render():
+    """Mark the pixel buffer dirty so the render task shows it."""
+    render_wake.set()
+
+async def render_loop():
+    """Background task that pushes the pixel buffer to the LEDs when dirty."""
+    while True:
+        await render_wake.wait()
+        render_wake.clear()
+        try:
+            await asyncio.to_thread(show)
+        except Exception as e:
+            logger.error("Error updating display: %s", e)
+
+        # Coalesce everything that arrives during the frame interval
+        await asyncio.sleep(FRAME_INTERVAL)
+
+def save_grid_to_history(pixels: np.ndarray):
+    """Save a grid to the history with timestamp, packed as 192 RGB bytes."""
+    global history_body, history_index, history_count
+
+    # Formatting to ISO strings is deferred until /history is serialized
+    history_slots[history_index] = {
+        'grid_bytes': pixels.tobytes(),
+        'timestamp': time.time()
     }
-    grid_history.appendleft(entry)
-    logger.info(f"Grid saved to history. Total entries: {len(grid_history)}")
+    history_index = (history_index + 1) % MAX_HISTORY
+    history_count = min(history_count + 1, MAX_HISTORY)
+    history_body = None
+    logger.info("Grid saved to history. Total entries: %d", history_count)
+
+def history_entries() -> list:
+    """Return the saved history entries, newest first."""
+    return [history_slots[(history_index - 1 - i) % MAX_HISTORY] for i in range(history_count)]
+
+def bytes_to_grid(grid_bytes: bytes) -> list:
+    """Expand packed RGB bytes back into the 8x8 grid of color dicts."""
+    channels = iter(grid_bytes)
+    colors = [{'r': r, 'g': g, 'b': b} for r, g, b in zip(channels, channels, channels)]
+    return [colors[y * GRID_WIDTH:(y + 1) * GRID_WIDTH] for y in range(GRID_HEIGHT)]
+
+def serialize_history() -> bytes:
+    """Serialize the history as the /history JSON body."""
+    grids = []
+    for entry in history_entries():
+        timestamp = datetime.fromtimestamp(entry['timestamp']).isoformat()
+        grids.append({'id': timestamp, 'grid': bytes_to_grid(entry['grid_bytes']), 'timestamp': timestamp})
+    return orjson.dumps({'grids': grids})
 
 def init_unicorn():
     """Initialize the Unicorn HAT."""
@@ -116,7 +377,7 @@ def set_pixel(x: int, y: int, r: int, g: int, b: int):
     if UNICORN_AVAILABLE:
         unicorn.set_pixel(x, y, r, g, b)
     else:
-        logger.debug(f"Simulation: Set pixel ({x}, {y}) to RGB({r}, {g}, {b})")
+        logger.debug("Simulation: Set pixel (%d, %d) to RGB(%d, %d, %d)", x, y, r, g, b)
 
 def show():
     """Update the Unicorn HAT display."""
@@ -127,69 +388,52 @@ def show():
 
 def clear():
     """Clear all pixels on the Unicorn HAT."""
+    global last_frame
+
     if UNICORN_AVAILABLE:
         unicorn.off()
         logger.info("Unicorn HAT turned off")
     else:
         logger.info("Simulation: Display cleared")
 
-def validate_color(color: dict) -> tuple:
-    """
-    Validate and extract RGB values from a color dict.
-    Returns (r, g, b) tuple or raises ValueError.
-    """
-    if not isinstance(color, dict):
-        raise ValueError("Color must be an object with r, g, b keys")
-    
-    r = color.get('r', 0)
-    g = color.get('g', 0)
-    b = color.get('b', 0)
-    
-    for val, name in [(r, 'r'), (g, 'g'), (b, 'b')]:
-        if not isinstance(val, int) or val < 0 or val > 255:
-            raise ValueError(f"Color component '{name}' must be an integer between 0 and 255")
-    
-    return (r, g, b)
-
-def validate_grid(grid: list) -> list:
-    """
-    Validate the grid structure.
-    Expects an 8x8 array of color objects {r, g, b}.
-    Returns validated grid or raises ValueError.
-    """
-    if not isinstance(grid, list) or len(grid) != GRID_HEIGHT:
-        raise ValueError(f"Grid must be an array of {GRID_HEIGHT} rows")
-    
-    validated_grid = []
-    for y, row in enumerate(grid):
-        if not isinstance(row, list) or len(row) != GRID_WIDTH:
-            raise ValueError(f"Row {y} must be an array of {GRID_WIDTH} colors")
-        
-        validated_row = []
-        for x, color in enumerate(row):
-            try:
-                validated_row.append(validate_color(color))
-            except ValueError as e:
-                raise ValueError(f"Invalid color at position ({x}, {y}): {e}")
-        
-        validated_grid.append(validated_row)
-    
-    return validated_grid
-
-@app.route('/health', methods=['GET', 'POST'])
-def health_check():
+    last_frame = None
+
+def set_brightness_level(brightness: float):
+    """Set the Unicorn HAT brightness."""
+    if UNICORN_AVAILABLE:
+        unicorn.brightness(brightness)
+
+def set_pixels(pixels: np.ndarray):
+    """Set every pixel on the Unicorn HAT from an (8, 8, 3) uint8 array."""
+    if UNICORN_AVAILABLE:
+        # The ws281x driver expects plain ints, so hand it a nested list of rows
+        unicorn.set_pixels(pixels.tolist())
+    else:
+        logger.debug("Simulation: Set all pixels")
+
+def grid_to_pixels(grid: list) -> np.ndarray:
+    """Pack a validated grid of Colors into an (8, 8, 3) uint8 array."""
+    pack = RGB_STRUCT.pack
+    rgb = b''.join([pack(color.r, color.g, color.b) for row in grid for color in row])
+    return np.frombuffer(rgb, dtype=np.uint8).reshape(GRID_HEIGHT, GRID_WIDTH, 3)
+
+def draw_pixel(x: int, y: int, color: Color):
+    """Apply a single validated pixel to the Unicorn HAT buffer."""
+    global last_frame
+
+    set_pixel(x, y, color.r, color.g, color.b)
+    last_frame = None
+
+@app.api_route('/health', methods=['GET', 'POST'])
+async def health_check():
     """Health check endpoint."""
-    return jsonify({
-        'status': 'ok',
-        'unicorn_available': UNICORN_AVAILABLE,
-        'grid_size': {'width': GRID_WIDTH, 'height': GRID_HEIGHT}
-    })
+    return Response(HEALTH_BODY, media_type='application/json')
 
-@app.route('/grid', methods=['POST'])
-def update_grid():
+@app.post('/grid')
+async def update_grid(request: Request):
     """
     Update the entire 8x8 grid.
-    
+
     Expected JSON body:
     {
         "grid": [
@@ -198,41 +442,40 @@ def update_grid():
         ]
     }
     """
+    global last_frame
+
+    payload = await read_payload(request, GridPayload)
+
     try:
-        data = request.get_json()
-        
-        if not data or 'grid' not in data:
-            return jsonify({'error': 'Request must include "grid" field'}), 400
-        
-        validated_grid = validate_grid(data['grid'])
-        
-        # Apply colors to the Unicorn HAT
-        for y, row in enumerate(validated_grid):
-            for x, (r, g, b) in enumerate(row):
-                set_pixel(x, y, r, g, b)
-        
-        show()
-        
+        pixels = grid_to_pixels(payload.grid)
+        frame = pixels.tobytes()
+
+        # Skip the hardware write when the frame is already on display
+        if frame != last_frame:
+            # Runs on the event loop with no await in between, so overlapping
+            # requests cannot interleave their writes into the driver buffer
+            last_frame = None
+            set_pixels(pixels)
+            last_frame = frame
+            request_render()
+
         # Schedule auto-off after 10 seconds
         schedule_auto_off()
-        
-        # Save the original grid data (with dict format) to history
-        save_grid_to_history(data['grid'])
-        
+
+        save_grid_to_history(pixels)
+
         logger.info("Grid updated successfully")
-        return jsonify({'status': 'success', 'message': 'Grid updated'})
-    
-    except ValueError as e:
-        return jsonify({'error': str(e)}), 400
+        return ojsonify({'status': 'success', 'message': 'Grid updated'})
+
     except Exception as e:
         logger.error(f"Error updating grid: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}, 500)
 
-@app.route('/pixel', methods=['POST'])
-def update_pixel():
+@app.post('/pixel')
+async def update_pixel(request: Request):
     """
     Update a single pixel.
-    
+
     Expected JSON body:
     {
         "x": 0,
@@ -240,91 +483,73 @@ def update_pixel():
         "color": {"r": 255, "g": 0, "b": 0}
     }
     """
+    payload = await read_payload(request, PixelPayload)
+
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'Request body required'}), 400
-        
-        x = data.get('x')
-        y = data.get('y')
-        color = data.get('color')
-        
-        if x is None or y is None:
-            return jsonify({'error': 'x and y coordinates required'}), 400
-        
-        if not (0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT):
-            return jsonify({'error': f'Coordinates must be within 0-{GRID_WIDTH-1}'}), 400
-        
-        if color is None:
-            return jsonify({'error': 'color object required'}), 400
-        
-        r, g, b = validate_color(color)
-        set_pixel(x, y, r, g, b)
-        show()
-        
+        x, y, color = payload.x, payload.y, payload.color
+
+        # Any bit outside 0-7 (including the sign bits of negatives) is out of range
+        if (x | y) & COORD_MASK:
+            return ojsonify({'error': f'Coordinates must be within 0-{GRID_WIDTH-1}'}, 400)
+
+        # Buffer writes stay on the event loop like /grid; the LED transfer
+        # happens in render_loop
+        draw_pixel(x, y, color)
+        request_render()
+
         # Schedule auto-off after 10 seconds
         schedule_auto_off()
-        
-        logger.info(f"Pixel ({x}, {y}) updated to RGB({r}, {g}, {b})")
-        return jsonify({'status': 'success', 'message': f'Pixel ({x}, {y}) updated'})
-    
-    except ValueError as e:
-        return jsonify({'error': str(e)}), 400
+
+        logger.info("Pixel (%d, %d) updated to RGB(%d, %d, %d)", x, y, color.r, color.g, color.b)
+        return ojsonify({'status': 'success', 'message': f'Pixel ({x}, {y}) updated'})
+
     except Exception as e:
         logger.error(f"Error updating pixel: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}, 500)
 
-@app.route('/clear', methods=['POST'])
-def clear_grid():
+@app.post('/clear')
+async def clear_grid():
     """Clear all pixels (turn off all LEDs)."""
     try:
-        # Cancel any pending auto-off timer
+        # Cancel any pending auto-off
         cancel_auto_off()
-        clear()
+        await asyncio.to_thread(clear)
         logger.info("Grid cleared")
-        return jsonify({'status': 'success', 'message': 'Grid cleared'})
+        return ojsonify({'status': 'success', 'message': 'Grid cleared'})
     except Exception as e:
         logger.error(f"Error clearing grid: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}, 500)
 
-@app.route('/brightness', methods=['POST'])
-def set_brightness():
+@app.post('/brightness')
+async def set_brightness(request: Request):
     """
     Set display brightness.
-    
+
     Expected JSON body:
     {
         "brightness": 0.5  // Value between 0.0 and 1.0
     }
     """
+    payload = await read_payload(request, BrightnessPayload)
+
     try:
-        data = request.get_json()
-        
-        if not data or 'brightness' not in data:
-            return jsonify({'error': 'brightness value required'}), 400
-        
-        brightness = data['brightness']
-        
-        if not isinstance(brightness, (int, float)) or brightness < 0 or brightness > 1:
-            return jsonify({'error': 'brightness must be a number between 0 and 1'}), 400
-        
-        if UNICORN_AVAILABLE:
-            unicorn.brightness(brightness)
-            show()
-        
-        logger.info(f"Brightness set to {brightness}")
-        return jsonify({'status': 'success', 'message': f'Brightness set to {brightness}'})
-    
+        brightness = payload.brightness
+
+        await asyncio.to_thread(set_brightness_level, brightness)
+        request_render()
+
+        logger.info("Brightness set to %s", brightness)
+        return ojsonify({'status': 'success', 'message': f'Brightness set to {brightness}'})
+
     except Exception as e:
         logger.error(f"Error setting brightness: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}, 500)
 
-@app.route('/history', methods=['GET', 'POST'])
-def get_history():
+@app.api_route('/history', methods=['GET', 'POST'])
+async def get_history():
     """
     Get the last 10 submitted grids.
-    
+
     Returns:
     {
         "grids": [
@@ -337,48 +562,49 @@ def get_history():
         ]
     }
     """
+    global history_body
+
     try:
-        return jsonify({'grids': list(grid_history)})
+        if history_body is None:
+            history_body = serialize_history()
+        return Response(history_body, media_type='application/json')
     except Exception as e:
         logger.error(f"Error getting history: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}, 500)
 
 
-@app.route('/generate', methods=['POST'])
-def generate_grid():
+@app.post('/generate')
+async def generate_grid(request: Request):
     """
     Generate an 8x8 pixel art grid from a word using AI.
-    
+
     Expected JSON body:
     {
         "word": "heart"
     }
-    
+
     Returns:
     {
         "grid": [[{"r": 255, "g": 0, "b": 0}, ...], ...],
         "word": "heart"
     }
     """
+    if openai_client is None:
+        return ojsonify({'error': 'AI generation not available. OPENAI_API_KEY not configured.'}, 503)
+
+    payload = await read_payload(request, GeneratePayload)
+
     try:
-        if openai_client is None:
-            return jsonify({'error': 'AI generation not available. OPENAI_API_KEY not configured.'}), 503
-        
-        data = request.get_json()
-        
-        if not data or 'word' not in data:
-            return jsonify({'error': 'Request must include "word" field'}), 400
-        
-        word = data['word'].strip()
-        
+        word = payload.word.strip()
+
         if not word:
-            return jsonify({'error': 'Word cannot be empty'}), 400
-        
+            return ojsonify({'error': 'Word cannot be empty'}, 400)
+
         if len(word) > 50:
-            return jsonify({'error': 'Word must be 50 characters or less'}), 400
-        
+            return ojsonify({'error': 'Word must be 50 characters or less'}, 400)
+
         logger.info(f"Generating grid for word: {word}")
-        
+
         # Call OpenAI to generate the grid
         prompt = f"""Create an 8x8 pixel art icon for "{word}".
 
@@ -408,7 +634,7 @@ For "{word}", think about:
 
 Return the 8x8 JSON array for "{word}":"""
 
-        response = openai_client.chat.completions.create(
+        response = await openai_client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {
@@ -423,46 +649,44 @@ Return the 8x8 JSON array for "{word}":"""
             temperature=0.5,
             max_tokens=2000
         )
-        
+
         # Parse the response
         ai_response = response.choices[0].message.content.strip()
         logger.info(f"AI response received: {ai_response[:100]}...")
-        
+
         # Clean up the response - remove markdown code blocks if present
         if ai_response.startswith("```"):
             # Remove markdown code block
             lines = ai_response.split('\n')
             # Remove first line (```json or ```) and last line (```)
             ai_response = '\n'.join(lines[1:-1] if lines[-1] == '```' else lines[1:])
-        
-        # Parse JSON
+
+        # Parse and validate the grid in a single pass
         try:
-            grid = json.loads(ai_response)
-        except json.JSONDecodeError as e:
+            grid = msgspec.json.decode(ai_response, type=Grid)
+        except msgspec.ValidationError as e:
+            logger.error(f"AI generated invalid grid structure: {e}")
+            return ojsonify({'error': f'AI generated invalid grid: {e}. Please try again.'}, 500)
+        except msgspec.DecodeError as e:
             logger.error(f"Failed to parse AI response as JSON: {e}")
             logger.error(f"Response was: {ai_response}")
-            return jsonify({'error': 'AI generated invalid response. Please try again.'}), 500
-        
-        # Validate the grid structure
-        try:
-            validate_grid(grid)
-        except ValueError as e:
-            logger.error(f"AI generated invalid grid structure: {e}")
-            return jsonify({'error': f'AI generated invalid grid: {e}. Please try again.'}), 500
-        
+            return ojsonify({'error': 'AI generated invalid response. Please try again.'}, 500)
+
         logger.info(f"Successfully generated grid for word: {word}")
-        return jsonify({
-            'grid': grid,
+        return ojsonify({
+            'grid': msgspec.to_builtins(grid),
             'word': word
         })
-    
+
     except Exception as e:
         logger.error(f"Error generating grid: {e}")
-        return jsonify({'error': 'Failed to generate grid. Please try again.'}), 500
+        return ojsonify({'error': 'Failed to generate grid. Please try again.'}, 500)
 
 # Initialize Unicorn HAT on startup
 init_unicorn()
 
 if __name__ == '__main__':
+    import uvicorn
+
     # Run on all interfaces so it's accessible from other devices
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    uvicorn.run(app, host='0.0.0.0', port=5000, workers=1, loop='uvloop')
@@ -0,0 +1,13 @@
+"""
+Gunicorn configuration for running the API in production.
+Start with: gunicorn -c gunicorn.conf.py app:app
+"""
+
+bind = '0.0.0.0:5000'
+
+# Uvicorn workers serve the ASGI app on an asyncio event loop
+worker_class = 'uvicorn_worker.UvicornWorker'
+
+# The HAT is a single device and display state lives in process memory,
+# so exactly one worker must own it
+workers = 1
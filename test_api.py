@@ -9,10 +9,14 @@ import time
 
 BASE_URL = "http://localhost:5000"
 
+# Share one keep-alive connection across all tests
+session = requests.Session()
+session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
 def test_health():
     """Test the health endpoint."""
     print("\n=== Testing Health Endpoint ===")
-    response = requests.get(f"{BASE_URL}/health")
+    response = session.get(f"{BASE_URL}/health")
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     return response.status_code == 200
@@ -20,7 +24,7 @@ def test_health():
 def test_clear():
     """Test clearing the grid."""
     print("\n=== Testing Clear Endpoint ===")
-    response = requests.post(f"{BASE_URL}/clear")
+    response = session.post(f"{BASE_URL}/clear")
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     return response.status_code == 200
@@ -33,7 +37,7 @@ def test_single_pixel():
         "y": 4,
         "color": {"r": 255, "g": 0, "b": 0}
     }
-    response = requests.post(f"{BASE_URL}/pixel", json=data)
+    response = session.post(f"{BASE_URL}/pixel", json=data)
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     return response.status_code == 200
@@ -42,7 +46,7 @@ def test_brightness():
     """Test setting brightness."""
     print("\n=== Testing Brightness Endpoint ===")
     data = {"brightness": 0.3}
-    response = requests.post(f"{BASE_URL}/brightness", json=data)
+    response = session.post(f"{BASE_URL}/brightness", json=data)
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     return response.status_code == 200
@@ -71,7 +75,7 @@ def test_full_grid():
         grid.append(row)
     
     data = {"grid": grid}
-    response = requests.post(f"{BASE_URL}/grid", json=data)
+    response = session.post(f"{BASE_URL}/grid", json=data)
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     return response.status_code == 200
@@ -83,21 +87,33 @@ def test_invalid_requests():
     # Invalid grid size
     print("\nTest: Invalid grid size")
     data = {"grid": [[{"r": 0, "g": 0, "b": 0}]]}
-    response = requests.post(f"{BASE_URL}/grid", json=data)
+    response = session.post(f"{BASE_URL}/grid", json=data)
     print(f"Status: {response.status_code} (expected 400)")
     
     # Invalid color value
     print("\nTest: Invalid color value")
     data = {"x": 0, "y": 0, "color": {"r": 300, "g": 0, "b": 0}}
-    response = requests.post(f"{BASE_URL}/pixel", json=data)
+    response = session.post(f"{BASE_URL}/pixel", json=data)
     print(f"Status: {response.status_code} (expected 400)")
     
     # Invalid coordinates
     print("\nTest: Invalid coordinates")
     data = {"x": 10, "y": 0, "color": {"r": 255, "g": 0, "b": 0}}
-    response = requests.post(f"{BASE_URL}/pixel", json=data)
+    response = session.post(f"{BASE_URL}/pixel", json=data)
+    print(f"Status: {response.status_code} (expected 400)")
+    
+    # Negative coordinates
+    print("\nTest: Negative coordinates")
+    data = {"x": -1, "y": 3, "color": {"r": 255, "g": 0, "b": 0}}
+    response = session.post(f"{BASE_URL}/pixel", json=data)
     print(f"Status: {response.status_code} (expected 400)")
     
+    # Oversized body (limit is 4096 bytes)
+    print("\nTest: Oversized body")
+    data = {"grid": "x" * 5000}
+    response = session.post(f"{BASE_URL}/grid", json=data)
+    print(f"Status: {response.status_code} (expected 413)")
+    
     return True
 
 def main():